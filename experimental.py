@@ -1,67 +1,332 @@
-import json
+import asyncio
+import atexit
+import hashlib
+import re
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Literal, Optional
+import diskcache
+import httpx
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-from uuid import uuid4
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from playwright.async_api import async_playwright
+
+# Only <body> text reaches the LLM, so <head> is never parsed. Requiring the
+# body tag right after </head> keeps "<body" inside head scripts from matching
+_BODY_OPEN = re.compile(r"</head\s*>\s*(<body[\s>])", re.IGNORECASE)
+
+# First fenced action block, with or without a json language tag
+_JSON_BLOCK = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Result prefixes that mark a failed agent run
+_ERROR_RE = re.compile(
+    r"^(?:FETCH_ERROR|RENDER_ERROR|EXTRACTION_ERROR|AGENT_ERROR|MAX_STEPS_REACHED|PARSE_ERROR)"
+)
+
+# Boilerplate stripped before text extraction (strip_tags requires a list)
+UNWANTED_TAGS = ["script", "style", "svg", "nav", "footer", "header", "form"]
+
+# Prefer HTML; responses of other text types are still parsed
+SCRAPE_ACCEPT = "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"
+# PDFs, images and other binaries are skipped instead of downloaded
+_TEXTUAL_TYPES = ("text/", "html", "json", "xml")
+
+MAX_PARALLEL_PAGES = 3  # Concurrent Playwright pages per render batch
+PAGE_CACHE_DIR = "/tmp/groqscraper"
+PAGE_CACHE_TTL = 600  # Seconds a cleaned page stays reusable
+CONTENT_STORE_SIZE = 32  # Most recent pages kept for extraction
+LLM_CACHE_SIZE = 64  # Planner replies kept for repeated queries
+_ACTIONS = {"fetch", "fetch_batch", "render", "render_batch", "extract", "response"}
+
+# A small fast model plans; the formatter writes the user-facing answer
+STEP_MODELS = {"plan": "llama-3.1-8b-instant", "final": "llama3-70b-8192"}
+
+@lru_cache(maxsize=32)
+def _parse_document(html: str) -> LexborHTMLParser:
+    """Parse stored content once so repeated extractions reuse the tree"""
+    return LexborHTMLParser(html)
+
+def _page_key(*parts: str) -> str:
+    """Stable cache key for a fetched or rendered page"""
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+def _is_textual(content_type: str) -> bool:
+    """Whether a response body is worth cleaning; unlabelled ones are kept"""
+    content_type = content_type.lower()
+    return not content_type or any(t in content_type for t in _TEXTUAL_TYPES)
+
+def _first_json_object(text: str) -> Optional[str]:
+    """First balanced {...} span, ignoring braces inside JSON strings"""
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _close_at_exit(scraper_ref: weakref.ref):
+    """Close a scraper at exit without keeping it alive until then"""
+    scraper = scraper_ref()
+    if scraper is not None:
+        scraper.close()
+
+class AgentResult(dict):
+    """Agent output whose "formatted" entry appears once formatting finishes"""
+    def __init__(self, raw_data: str, formatted: Future):
+        # Only resolved values are stored, so the dict serialises and prints cleanly
+        super().__init__(raw_data=raw_data)
+        self._formatted = formatted
+        formatted.add_done_callback(self._store_formatted)
+
+    def _store_formatted(self, future: Future):
+        if not future.cancelled() and future.exception() is None:
+            self.setdefault("formatted", future.result())
+
+    def __missing__(self, key):
+        if key != "formatted":
+            raise KeyError(key)
+        # Block until ready; formatting errors propagate to the caller
+        return self.setdefault("formatted", self._formatted.result())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    @property
+    def raw_data(self) -> str:
+        return self["raw_data"]
+
+    @property
+    def formatted(self) -> str:
+        return self["formatted"]
 
 class GroqWebScraper:
     def __init__(self, groq_api_key: str):
         self.groq_api_key = groq_api_key
         self.max_html_length = 6000
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
-        self.content_store = {}  # Stores fetched content with UUID keys
+        self.content_store = OrderedDict()  # LRU of fetched content keyed by hash
+        self._loop = None  # Event loop shared by async fetches and the browser
+        self._pw = None
+        self._browser = None
+        self._exit_hook_registered = False
+        self.page_cache = diskcache.Cache(PAGE_CACHE_DIR)
+        self.llm_cache = OrderedDict()  # LRU of planner replies by model and history hash
+        self.cache_llm_responses = True  # Disable to resample at temperature > 0
+        self._format_pool = ThreadPoolExecutor(max_workers=2)
         self.session = requests.Session()
         self.session.headers.update({
             "Authorization": f"Bearer {self.groq_api_key}",
             "Content-Type": "application/json"
         })
 
+        # Pooled session so repeat hits to a host reuse the TCP/TLS connection
+        self.scrape_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.scrape_session.mount("http://", adapter)
+        self.scrape_session.mount("https://", adapter)
+        self.scrape_session.headers["Accept"] = SCRAPE_ACCEPT
+
     def fetch_website(self, url: str) -> str:
         """Fetch and clean static HTML content"""
+        key = _page_key("fetch", url)
+        cached = self.page_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            return self._clean_html(response.text)
+            # Stream so a binary body is never downloaded
+            with self.scrape_session.get(url, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if not _is_textual(content_type):
+                    return f"SKIPPED_NON_HTML:{content_type}"
+                result = self._clean_html(response.text)
         except Exception as e:
             return f"FETCH_ERROR: {str(e)}"
 
+        self.page_cache.set(key, result, expire=PAGE_CACHE_TTL)
+        return result
+
+    def fetch_batch(self, urls: list) -> list:
+        """Fetch and clean several static pages concurrently"""
+        return self._run_async(self._fetch_batch_async(urls))
+
+    async def _fetch_batch_async(self, urls: list) -> list:
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=15,
+            follow_redirects=True,
+            headers={"Accept": SCRAPE_ACCEPT}
+        ) as client:
+            return await asyncio.gather(*(self._fetch_one(client, url) for url in urls))
+
+    async def _fetch_one(self, client: httpx.AsyncClient, url: str) -> str:
+        key = _page_key("fetch", url)
+        cached = self.page_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if not _is_textual(content_type):
+                    return f"SKIPPED_NON_HTML:{content_type}"
+                await response.aread()
+                result = self._clean_html(response.text)
+        except Exception as e:
+            return f"FETCH_ERROR: {str(e)}"
+
+        self.page_cache.set(key, result, expire=PAGE_CACHE_TTL)
+        return result
+
     def fetch_dynamic_content(self, url: str, wait_for: str = None) -> str:
         """Render JavaScript-heavy pages using Playwright"""
+        return self._run_async(self._render_one(url, wait_for))
+
+    def render_batch(self, urls: list, wait_for: str = None) -> list:
+        """Render several JavaScript-heavy pages concurrently"""
+        return self._run_async(self._render_batch_async(urls, wait_for))
+
+    async def _render_batch_async(self, urls: list, wait_for: str = None) -> list:
+        # Launch up front so concurrent renders share a single browser
+        try:
+            await self._get_browser()
+        except Exception as e:
+            return [f"RENDER_ERROR: {str(e)}"] * len(urls)
+        slots = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+
+        async def render(url: str) -> str:
+            async with slots:
+                return await self._render_one(url, wait_for)
+
+        return await asyncio.gather(*(render(url) for url in urls))
+
+    async def _render_one(self, url: str, wait_for: str = None) -> str:
+        key = _page_key("render", url, wait_for or "")
+        cached = self.page_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch()
-                page = browser.new_page()
-                page.goto(url)
+            browser = await self._get_browser()
+            context = await browser.new_context()
+            try:
+                page = await context.new_page()
+                await page.goto(url)
                 
                 if wait_for:
-                    page.wait_for_selector(wait_for, timeout=10000)
+                    await page.wait_for_selector(wait_for, timeout=10000)
                 
-                content = page.content()
-                browser.close()
-                return self._clean_html(content)
+                content = await page.content()
+            finally:
+                await context.close()
+            result = self._clean_html(content)
         except Exception as e:
             return f"RENDER_ERROR: {str(e)}"
 
+        self.page_cache.set(key, result, expire=PAGE_CACHE_TTL)
+        return result
+
+    async def _get_browser(self):
+        """Launch Chromium on first use and keep it for later renders"""
+        if self._browser is None:
+            pw = await async_playwright().start()
+            try:
+                browser = await pw.chromium.launch()
+            except Exception:
+                # Don't leave a driver process behind for every failed launch
+                await pw.stop()
+                raise
+            self._pw = pw
+            self._browser = browser
+            if not self._exit_hook_registered:
+                atexit.register(_close_at_exit, weakref.ref(self))
+                self._exit_hook_registered = True
+        return self._browser
+
+    def _run_async(self, coro):
+        """Run a coroutine on the scraper's persistent event loop"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        """Shut down the browser, event loop, page cache and format workers"""
+        if self._browser is not None:
+            self._run_async(self._browser.close())
+            self._run_async(self._pw.stop())
+            self._browser = None
+            self._pw = None
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+        self.page_cache.close()
+        # Formatting already in flight still completes
+        self._format_pool.shutdown(wait=False)
+
     def extract_data(self, html: str, selector: str) -> list:
         """Extract text content using CSS selectors"""
         try:
-            soup = BeautifulSoup(html, "html.parser")
-            return [elem.get_text(strip=True) for elem in soup.select(selector)]
+            tree = _parse_document(html)
+            return [node.text(strip=True) for node in tree.css(selector)]
         except Exception as e:
             return [f"EXTRACTION_ERROR: {str(e)}"]
 
     def _clean_html(self, html: str) -> str:
         """Simplify HTML for LLM processing"""
-        soup = BeautifulSoup(html, "html.parser")
+        body = _BODY_OPEN.search(html)
+        if body:
+            html = html[body.start(1):]
+
+        # Only max_html_length chars of text survive, so skip parsing the tail
+        budget = self.max_html_length * 8
+        if len(html) > budget:
+            html = html[:budget]
+            last_tag_end = html.rfind(">")
+            if last_tag_end != -1:
+                html = html[:last_tag_end + 1]
+
+        tree = LexborHTMLParser(html)
+        if tree.body is None:
+            return ""
         
         # Remove unwanted elements
-        for tag in ["script", "style", "svg", "nav", "footer", "header", "form"]:
-            for element in soup.find_all(tag):
-                element.decompose()
+        tree.strip_tags(UNWANTED_TAGS)
 
-        # Clean text and truncate
-        text = soup.get_text(separator="\n", strip=True)
-        return text[:self.max_html_length]
+        # Clean text and truncate in one C-level pass
+        return tree.body.text(separator="\n", strip=True)[:self.max_html_length]
 
     def _format_output(self, raw_data: str, original_query: str) -> str:
         """Post-process raw data into user-friendly format"""
@@ -92,48 +357,129 @@ class GroqWebScraper:
 
         response = self.session.post(
             self.base_url,
-            json=self._create_groq_payload(
-                messages,
-            )
-        ).json()
+            data=orjson.dumps(self._create_groq_payload(messages, step_kind="final"))
+        )
         
-        return response['choices'][0]['message']['content']
+        return orjson.loads(response.content)['choices'][0]['message']['content']
 
     def _store_content(self, content: str) -> str:
         """Store content and return reference key"""
-        content_id = str(uuid4())
+        # Identical pages share one entry across steps
+        content_id = hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
         self.content_store[content_id] = content
+        self.content_store.move_to_end(content_id)
+        if len(self.content_store) > CONTENT_STORE_SIZE:
+            self.content_store.popitem(last=False)
         return content_id
 
+    def _load_content(self, content_id: str) -> str:
+        """Look up stored content, marking it recently used"""
+        content = self.content_store.get(content_id)
+        if content is not None:
+            self.content_store.move_to_end(content_id)
+        return content
+
+    def _batch_urls(self, urls: list) -> list:
+        """Limit a batch so its pages cannot evict each other from the store"""
+        return urls[:CONTENT_STORE_SIZE]
+
+    def _dropped_urls(self, urls: list) -> list:
+        """Observation lines for batch URLs beyond the store size"""
+        return [f"SKIPPED_BATCH_LIMIT|{url}" for url in urls[CONTENT_STORE_SIZE:]]
+
     def _create_groq_payload(self, messages: list, 
                            temperature: float = 0.4,
-                           max_tokens: int = 1024) -> dict:
+                           step_kind: Literal["plan", "final"] = "plan",
+                           stream: bool = False) -> dict:
         """Flexible payload creation"""
         return {
-            "model": "llama3-70b-8192",
+            "model": STEP_MODELS[step_kind],
             "messages": messages,
             "temperature": temperature,
-            "max_tokens": max_tokens,
+            # Any planner reply may be the final "response", so every step keeps
+            # the full budget; short action steps are cut early by the stream
+            "max_tokens": 1024,
             "top_p": 0.9,
             "stop": ["<|eot_id|>"],
-            "stream": False
+            "stream": stream
         }
 
+    def _stream_llm_message(self, messages: list) -> str:
+        """Stream an LLM reply, stopping once the first action block closes"""
+        response = self.session.post(
+            self.base_url,
+            data=orjson.dumps(self._create_groq_payload(messages, step_kind="plan", stream=True)),
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+            message = ""
+            fences = 0
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+
+                delta = orjson.loads(data)["choices"][0]["delta"].get("content") or ""
+                # Rescan only the tail so a fence split across chunks is still seen
+                tail = message[-2:] + delta
+                new_fences = tail.count("```")
+                fences += new_fences
+                message += delta
+
+                # A block just closed; stop only if it completed a JSON action,
+                # so a css or other code block earlier in the reply is read past
+                if new_fences and fences >= 2 and _JSON_BLOCK.search(message):
+                    break
+            return message
+        finally:
+            response.close()
+
+    def _plan_step(self, messages: list) -> tuple:
+        """Get the next planner reply and its action, reusing a valid earlier one"""
+        key = None
+        if self.cache_llm_responses:
+            history = orjson.dumps(messages, option=orjson.OPT_SORT_KEYS)
+            key = hashlib.sha1(STEP_MODELS["plan"].encode() + b"\0" + history).hexdigest()
+            cached = self.llm_cache.get(key)
+            if cached is not None:
+                self.llm_cache.move_to_end(key)
+                return cached
+
+        llm_message = self._stream_llm_message(messages)
+        action = self._parse_llm_response(llm_message)
+
+        # Never replay a truncated or unparseable sample on later runs
+        if key is not None and self._is_valid_action(action):
+            self.llm_cache[key] = (llm_message, action)
+            if len(self.llm_cache) > LLM_CACHE_SIZE:
+                self.llm_cache.popitem(last=False)
+        return llm_message, action
+
+    def _is_valid_action(self, action) -> bool:
+        """Parsed reply names a known action and is not a parse failure"""
+        if not isinstance(action, dict) or action.get("action") not in _ACTIONS:
+            return False
+        return not self._is_error(str(action.get("content", "")))
+
     def _parse_llm_response(self, response: str) -> dict:
         """Improved JSON parsing with error recovery"""
         try:
             # Handle both ```json and ``` formats
-            json_str = response.split("```")[1]
-            if json_str.startswith("json\n"):
-                json_str = json_str[5:]
-            return json.loads(json_str)
-        except (IndexError, json.JSONDecodeError) as e:
+            match = _JSON_BLOCK.search(response)
+            if match is None:
+                raise ValueError("No JSON code block found")
+            return orjson.loads(match.group(1))
+        except ValueError as e:
             # Try to find JSON in response
+            json_str = _first_json_object(response)
+            if json_str is None:
+                return {"action": "response", "content": f"PARSE_ERROR: {str(e)}"}
             try:
-                start = response.find("{")
-                end = response.rfind("}") + 1
-                return json.loads(response[start:end])
-            except:
+                return orjson.loads(json_str)
+            except ValueError:
                 return {"action": "response", "content": f"PARSE_ERROR: {str(e)}"}
 
     def _run_scraping_operations(self, user_query: str) -> str:
@@ -146,60 +492,98 @@ class GroqWebScraper:
             "content": user_query
         }]
 
+        # Observations for actions already executed in this loop
+        observations = {}
+
         max_steps = 5
         for _ in range(max_steps):
             try:
-                # Get LLM response
-                response = self.session.post(
-                    self.base_url,
-                    json=self._create_groq_payload(conversation_history)
-                ).json()
-                
-                llm_message = response["choices"][0]["message"]["content"]
+                # Stream and parse LLM response
+                llm_message, action = self._plan_step(conversation_history)
                 print(f"\n[LLM STEP]\n{llm_message}\n")
-                
-                # Parse response
-                action = self._parse_llm_response(llm_message)
+
+                # Repeated actions replay their observation instead of re-running
+                action_key = orjson.dumps(action, option=orjson.OPT_SORT_KEYS)
+                if action_key in observations:
+                    conversation_history.append(observations[action_key])
+                    continue
                 
                 if action["action"] == "response":
                     return action["content"]
                 
                 elif action["action"] == "fetch":
                     result = self.fetch_website(action["url"])
+                    failed = self._is_error(result)
                     content_id = self._store_content(result)
                     conversation_history.append({
                         "role": "assistant",
                         "content": f"FETCHED:{content_id}|{action['url']}"
                     })
                 
+                elif action["action"] == "fetch_batch":
+                    urls = self._batch_urls(action["urls"])
+                    results = self.fetch_batch(urls)
+                    failed = any(self._is_error(result) for result in results)
+                    references = [
+                        f"FETCHED:{self._store_content(result)}|{url}"
+                        for url, result in zip(urls, results)
+                    ] + self._dropped_urls(action["urls"])
+                    conversation_history.append({
+                        "role": "assistant",
+                        "content": "\n".join(references)
+                    })
+                
                 elif action["action"] == "render":
                     result = self.fetch_dynamic_content(
                         action["url"],
                         action.get("wait_for")
                     )
+                    failed = self._is_error(result)
                     content_id = self._store_content(result)
                     conversation_history.append({
                         "role": "assistant",
                         "content": f"RENDERED:{content_id}|{action['url']}"
                     })
                 
+                elif action["action"] == "render_batch":
+                    urls = self._batch_urls(action["urls"])
+                    results = self.render_batch(
+                        urls,
+                        action.get("wait_for")
+                    )
+                    failed = any(self._is_error(result) for result in results)
+                    references = [
+                        f"RENDERED:{self._store_content(result)}|{url}"
+                        for url, result in zip(urls, results)
+                    ] + self._dropped_urls(action["urls"])
+                    conversation_history.append({
+                        "role": "assistant",
+                        "content": "\n".join(references)
+                    })
+                
                 elif action["action"] == "extract":
                     # Retrieve actual content from store
-                    content = self.content_store.get(action["content_id"])
+                    content = self._load_content(action["content_id"])
                     if not content:
                         result = ["CONTENT_NOT_FOUND"]
+                        failed = True
                     else:
                         result = self.extract_data(
                             content,
                             action["selector"]
                         )
+                        failed = any(self._is_error(item) for item in result)
                     conversation_history.append({
                         "role": "assistant",
-                        "content": f"EXTRACTED:{json.dumps(result)}"
+                        "content": f"EXTRACTED:{orjson.dumps(result).decode()}"
                     })
                 
                 else:
                     return "ERROR: Invalid action requested"
+
+                # Failed actions stay retryable instead of replaying the error
+                if not failed:
+                    observations[action_key] = conversation_history[-1]
             
             except Exception as e:
                 return f"AGENT_ERROR: {str(e)}"
@@ -208,10 +592,7 @@ class GroqWebScraper:
 
     def _is_error(self, result: str) -> bool:
         """Unified error detection"""
-        error_prefixes = ("FETCH_ERROR", "RENDER_ERROR", 
-                         "EXTRACTION_ERROR", "AGENT_ERROR",
-                         "MAX_STEPS_REACHED", "PARSE_ERROR")
-        return result.startswith(error_prefixes)
+        return _ERROR_RE.match(result) is not None
 
     def execute_agent_loop(self, user_query: str) -> dict:
         """Fixed error handling flow"""
@@ -220,68 +601,34 @@ class GroqWebScraper:
         if self._is_error(raw_result):
             return {"error": raw_result}
         
-        formatted = self._format_output(raw_result, user_query)
-        return {
-            "raw_data": raw_result,
-            "formatted": formatted
-        }
+        # Format in the background; raw data is usable immediately
+        formatted = self._format_pool.submit(self._format_output, raw_result, user_query)
+        return AgentResult(raw_result, formatted)
 
 GROQ_SYSTEM_PROMPT = """
-You are a senior web scraping agent powered by Groq's LLaMA 3 70B. Your task is to systematically:
-
-1. Analyze user requests
-2. Determine required data sources
-3. Execute appropriate actions
-4. Validate results
-5. Return structured data
-
-**Available Actions (JSON format only):**
-- Fetch static content: 
-```json
-{"action": "fetch", "url": "<target_url>"}
-```
-- Render dynamic content: 
-```json
-{"action": "render", "url": "<target_url>", "wait_for": "<css_selector>"}
-```
-- Extract data: 
-```json
-{
-  "action": "extract",
-  "content_id": "<CONTENT_REF_FROM_FETCH/RENDER>", 
-  "selector": "<css_selector>"
-}
-```
-- Final response: 
-```json
-{"action": "response", "content": "<final_answer>"}
-```
-
-**Content Reference Format:**
-After fetch/render operations, you'll receive a content ID reference like:
-"FETCHED:UUID|URL" - Use UUID in extraction requests
+You are a senior web scraping agent powered by Groq. Analyze the user request, choose data sources, execute actions, validate results and return structured data.
 
-**Workflow Rules:**
-1. Always start with basic fetch before rendering
-2. Verify content contains target data elements
-3. Use precise CSS selectors (classes > tags)
-4. Reference content IDs for extraction
-5. Validate extracted data format
-6. Retry with alternatives on failure
+**Available Actions (reply with exactly one per step, inside a ```json code block):**
+- Fetch static content: {"action": "fetch", "url": "<target_url>"}
+- Fetch several static pages at once: {"action": "fetch_batch", "urls": ["<target_url>", "<target_url>"]}
+- Render dynamic content: {"action": "render", "url": "<target_url>", "wait_for": "<css_selector>"}
+- Render several dynamic pages at once: {"action": "render_batch", "urls": ["<target_url>", "<target_url>"], "wait_for": "<css_selector>"}
+- Extract data: {"action": "extract", "content_id": "<CONTENT_REF_FROM_FETCH/RENDER>", "selector": "<css_selector>"}
+- Final response: {"action": "response", "content": "<final_answer>"}
 
+Fetch/render results arrive as "FETCHED:ID|URL" or "RENDERED:ID|URL"; use the ID as content_id.
+
+**Workflow Rules:**
+1. Fetch before rendering; render only if target data is missing
+2. Use precise CSS selectors (classes > tags)
+3. Validate extracted data and retry with alternatives on failure
+4. Keep reasoning brief and put the action block last
 
 **Ethical Guidelines:**
-- Respect robots.txt
-- Add 2s delay between requests
+- Respect robots.txt and website terms of service
+- Batch only as many URLs from one site as the task needs
 - Never scrape personal data
-- Honor website terms of service
-
-**Response Protocol:**
-- Use only JSON-formatted code blocks for actions
-- Include detailed error diagnostics
-- Maintain chain of thought reasoning
-- Validate all extracted data
-"""
+""".strip()
 
 FORMATTING_SYSTEM_PROMPT = """
 You are an expert data formatter with exceptional skills in presenting technical information clearly. Your task is to transform raw scraped data into polished, user-friendly output.
@@ -309,7 +656,7 @@ Raw data: ["$61,432.50", "2024-04-15", "CoinDesk"]
 ---
 
 Always end with a source attribution and update timestamp when available.
-"""
+""".strip()
 
 
 if __name__ == "__main__":
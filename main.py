@@ -1,8 +1,28 @@
 import json
+import re
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 from playwright.sync_api import sync_playwright
 
+# Only <body> text reaches the LLM, so <head> is never parsed. Requiring the
+# body tag right after </head> keeps "<body" inside head scripts from matching
+_BODY_OPEN = re.compile(r"</head\s*>\s*(<body[\s>])", re.IGNORECASE)
+
+# Boilerplate stripped before text extraction (strip_tags requires a list)
+UNWANTED_TAGS = ["script", "style", "svg", "nav", "footer", "header", "form"]
+
+# Prefer HTML; responses of other text types are still parsed
+SCRAPE_ACCEPT = "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"
+# PDFs, images and other binaries are skipped instead of downloaded
+_TEXTUAL_TYPES = ("text/", "html", "json", "xml")
+
+def _is_textual(content_type: str) -> bool:
+    """Whether a response body is worth cleaning; unlabelled ones are kept"""
+    content_type = content_type.lower()
+    return not content_type or any(t in content_type for t in _TEXTUAL_TYPES)
+
 class GroqWebScraper:
     def __init__(self, groq_api_key: str):
         self.groq_api_key = groq_api_key
@@ -14,12 +34,27 @@ class GroqWebScraper:
             "Content-Type": "application/json"
         })
 
+        # Pooled session so repeat hits to a host reuse the TCP/TLS connection
+        self.scrape_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.scrape_session.mount("http://", adapter)
+        self.scrape_session.mount("https://", adapter)
+        self.scrape_session.headers["Accept"] = SCRAPE_ACCEPT
+
     def fetch_website(self, url: str) -> str:
         """Fetch and clean static HTML content"""
         try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            return self._clean_html(response.text)
+            # Stream so a binary body is never downloaded
+            with self.scrape_session.get(url, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if not _is_textual(content_type):
+                    return f"SKIPPED_NON_HTML:{content_type}"
+                return self._clean_html(response.text)
         except Exception as e:
             return f"FETCH_ERROR: {str(e)}"
 
@@ -43,23 +78,34 @@ class GroqWebScraper:
     def extract_data(self, html: str, selector: str) -> list:
         """Extract text content using CSS selectors"""
         try:
-            soup = BeautifulSoup(html, "html.parser")
-            return [elem.get_text(strip=True) for elem in soup.select(selector)]
+            tree = LexborHTMLParser(html)
+            return [node.text(strip=True) for node in tree.css(selector)]
         except Exception as e:
             return [f"EXTRACTION_ERROR: {str(e)}"]
 
     def _clean_html(self, html: str) -> str:
         """Simplify HTML for LLM processing"""
-        soup = BeautifulSoup(html, "html.parser")
+        body = _BODY_OPEN.search(html)
+        if body:
+            html = html[body.start(1):]
+
+        # Only max_html_length chars of text survive, so skip parsing the tail
+        budget = self.max_html_length * 8
+        if len(html) > budget:
+            html = html[:budget]
+            last_tag_end = html.rfind(">")
+            if last_tag_end != -1:
+                html = html[:last_tag_end + 1]
+
+        tree = LexborHTMLParser(html)
+        if tree.body is None:
+            return ""
         
         # Remove unwanted elements
-        for tag in ["script", "style", "svg", "nav", "footer", "header", "form"]:
-            for element in soup.find_all(tag):
-                element.decompose()
+        tree.strip_tags(UNWANTED_TAGS)
 
-        # Clean text and truncate
-        text = soup.get_text(separator="\n", strip=True)
-        return text[:self.max_html_length]
+        # Clean text and truncate in one C-level pass
+        return tree.body.text(separator="\n", strip=True)[:self.max_html_length]
 
     def _create_groq_payload(self, messages: list) -> dict:
         """Construct Groq API payload for Llama 3 70B"""
@@ -145,46 +191,20 @@ class GroqWebScraper:
         return "MAX_STEPS_REACHED: Processing limit exceeded"
 
 GROQ_SYSTEM_PROMPT = """
-You are a senior web scraping agent powered by Groq's LLaMA 3 70B. Your task is to systematically:
-
-1. Analyze user requests
-2. Determine required data sources
-3. Execute appropriate actions
-4. Validate results
-5. Return structured data
-
-**Available Actions (JSON format only):**
-- Fetch static content: 
-```json
-{"action": "fetch", "url": "<target_url>"}
-```
-- Render dynamic content: 
-```json
-{"action": "render", "url": "<target_url>", "wait_for": "<css_selector>"}
-```
-- Extract data: 
-```json
-{"action": "extract", "html": "<content>", "selector": "<css_selector>"}
-```
-- Final response: 
-```json
-{"action": "response", "content": "<final_answer>"}
-```
+You are a senior web scraping agent powered by Groq's LLaMA 3 70B. Analyze the user request, choose data sources, execute actions, validate results and return structured data.
+
+**Available Actions (reply with exactly one per step, inside a ```json code block):**
+- Fetch static content: {"action": "fetch", "url": "<target_url>"}
+- Render dynamic content: {"action": "render", "url": "<target_url>", "wait_for": "<css_selector>"}
+- Extract data: {"action": "extract", "html": "<content>", "selector": "<css_selector>"}
+- Final response: {"action": "response", "content": "<final_answer>"}
 
 **Workflow Rules:**
-1. Always start with basic fetch before rendering
-2. Verify content contains target data elements
-3. Use precise CSS selectors (classes > tags)
-4. Handle pagination if needed
-5. Validate extracted data format
-6. Retry with alternatives on failure
-
-**Response Protocol:**
-- Use only JSON-formatted code blocks for actions
-- Include detailed error diagnostics
-- Maintain chain of thought reasoning
-- Validate all extracted data
-"""
+1. Fetch before rendering; render only if target data is missing
+2. Use precise CSS selectors (classes > tags) and handle pagination if needed
+3. Validate extracted data and retry with alternatives on failure
+4. Keep reasoning brief and put the action block last
+""".strip()
 
 if __name__ == "__main__":
     # Initialize with your Groq API key